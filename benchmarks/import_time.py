@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+# Seconds allowed for a plain import of src.utility in a fresh interpreter
+BUDGET = 0.5
+# Only needed to assess, fit, scale or plot
+HEAVY = ["lmfit", "scipy", "plotly", "diofant"]
+
+CODE = """
+import json, sys, time
+start = time.perf_counter()
+from src.utility import Utility
+elapsed = time.perf_counter() - start
+print(json.dumps([elapsed, [m for m in {heavy} if m in sys.modules]]))
+""".format(heavy=HEAVY)
+
+
+def measure(repeat=5):
+    """
+    Return the best import time over repeat fresh interpreters and the heavy
+    modules loaded by the import
+    """
+    project_dir = Path(__file__).resolve().parents[1]
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.check_output(
+            [sys.executable, "-c", CODE], cwd=str(project_dir)
+        )
+        runs.append(json.loads(output))
+    elapsed = min(run[0] for run in runs)
+    loaded = sorted(set(m for run in runs for m in run[1]))
+    return elapsed, loaded
+
+
+def main():
+    elapsed, loaded = measure()
+    print(
+        "from src.utility import Utility: {:.3f}s (budget {}s)".format(elapsed, BUDGET)
+    )
+    if loaded:
+        print("heavy modules imported: {}".format(", ".join(loaded)))
+    if elapsed > BUDGET or loaded:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
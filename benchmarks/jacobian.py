@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+project_dir = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_dir))
+
+from src.utility import Utility, fit_many  # noqa: E402
+
+
+def fits(n=200, seed=0):
+    """
+    Yield assessed points of synthetic indicators and starting parameters
+    20% away from their solution
+    """
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame(rng.gamma(2, 1, (24, n)) + 0.5)
+    for u in fit_many(frame).values():
+        start = {
+            name: value * rng.uniform(0.8, 1.2) for name, value in u.params.items()
+        }
+        yield u.points, start
+
+
+def main():
+    """
+    Compare the function evaluations and time of fit with the analytic
+    jacobian and with finite differences
+    """
+    problems = list(fits())
+    # Pays the import of lmfit outside of the timings
+    Utility(name="u", points=problems[0][0]).fit()
+    for jacobian in (True, False):
+        nfev = 0
+        start = time.perf_counter()
+        for points, params in problems:
+            # Plain values, turned into Parameters by fit
+            u = Utility(name="u", points=points, params=dict(params))
+            nfev += u.fit(jacobian=jacobian).nfev
+        elapsed = time.perf_counter() - start
+        print(
+            "jacobian={}: {} evaluations, {:.3f}s for {} fits".format(
+                jacobian, nfev, elapsed, len(problems)
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
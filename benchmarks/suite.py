@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+import json
+import sys
+import time
+import timeit
+from pathlib import Path
+
+import attr
+import click
+import numpy as np
+import pandas as pd
+
+project_dir = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_dir))
+
+from src.utility import Utility, fit_many  # noqa: E402
+
+RESULTS_DIR = Path(project_dir, "benchmarks/results")
+# Slowdown over the previous run reported as a regression
+TOLERANCE = 1.25
+
+SIZES = {
+    "assess": [30, 1000, 100000, 1000000],
+    "scale": [2, 5, 10, 50, 100],
+    "rows": 10000000,
+}
+QUICK_SIZES = {"assess": [30, 1000], "scale": [2, 10, 50], "rows": 100000}
+
+INDICATORS = ["ndocs", "nparam", "ncenters", "nbeds", "npharma"]
+
+
+def synthetic_data(n, seed=0):
+    """
+    Return n positive, right skewed values, like indicators per inhabitant
+    """
+    return np.random.default_rng(seed).gamma(2, 1, n) + 0.5
+
+
+def synthetic_mauf(seed=0):
+    """
+    Return a fitted MAUF shaped like the one of the exploratory notebook
+    """
+    frame = pd.DataFrame(
+        {name: synthetic_data(24, seed + i) for i, name in enumerate(INDICATORS)}
+    )
+    u = fit_many(frame)
+    access_to_pros = u["ndocs"] * u["nparam"]
+    access_to_pros.name = "AP"
+    access_to_pros.scale(ndocs=0.7, nparam=0.6)
+    access_to_facilities = u["ncenters"] * u["nbeds"]
+    access_to_facilities.name = "AF"
+    access_to_facilities.scale(ncenters=0.8, nbeds=0.4)
+    facilities_and_pros = access_to_pros * access_to_facilities
+    facilities_and_pros.scale(AP=0.8, AF=0.6)
+    mauf = facilities_and_pros * u["npharma"]
+    mauf.scale(AP_AF=0.7, npharma=0.2)
+    return mauf
+
+
+def best_of(statement, setup=lambda: None, repeat=3):
+    """
+    Return the best wall time of statement over repeat runs, setup being
+    called untimed before each of them
+    """
+    times = []
+    for _ in range(repeat):
+        setup()
+        times.append(timeit.timeit(statement, number=1))
+    return min(times)
+
+
+def bench_assess(sizes):
+    results = {}
+    for n in sizes:
+        data = synthetic_data(n)
+        u = Utility(name="u", optimal_fit=True, data=data)
+
+        def reset():
+            # Cold start, not from the previous assessment
+            u.points = None
+
+        results["assess[{}]".format(n)] = best_of(u.assess, reset)
+    return results
+
+
+def bench_fit():
+    u = Utility(name="u", optimal_fit=True, data=synthetic_data(24))
+    u.points = fit_many(pd.DataFrame({"u": u.data}))["u"].points
+
+    def reset():
+        u.params = None
+
+    return {"fit": best_of(u.fit, reset)}
+
+
+def bench_scale(sizes):
+    results = {}
+    rng = np.random.default_rng(0)
+    for n in sizes:
+        scaling_constants = {
+            "k{}".format(i): k for i, k in enumerate(rng.uniform(0.05, 0.5, n))
+        }
+        u = Utility(name="u")
+        results["scale[{}]".format(n)] = best_of(lambda: u.scale(**scaling_constants))
+    return results
+
+
+def bench_eval(rows):
+    mauf = synthetic_mauf()
+    x = {name: synthetic_data(rows, i) for i, name in enumerate(INDICATORS)}
+    leaf = mauf.saufs["npharma"]
+    plan = mauf.compile()
+    results = {
+        "normalized_model[{}]".format(rows): best_of(
+            lambda: leaf.normalized_model(x["npharma"])
+        ),
+        "eval[{}]".format(rows): best_of(lambda: mauf.eval(x)),
+        "plan_eval[{}]".format(rows): best_of(lambda: plan.eval(x)),
+    }
+    for interpolation in ("linear", "pchip"):
+        interpolated = attr.evolve(leaf, interpolation=interpolation)
+        results["{}_model[{}]".format(interpolation, rows)] = best_of(
+            lambda: interpolated.normalized_model(x["npharma"])
+        )
+    return results
+
+
+def compare(results, previous):
+    for name, seconds in results.items():
+        line = "{:<28}{:>12.6f}s".format(name, seconds)
+        if name in previous:
+            ratio = seconds / previous[name]
+            line += "{:>8.2f}x".format(ratio)
+            if ratio > TOLERANCE:
+                line += "  REGRESSION"
+        print(line)
+
+
+@click.command()
+@click.option("--quick", is_flag=True, help="Smaller sizes, for a quick check")
+@click.option("--save/--no-save", default=True, help="Store the results")
+def main(quick, save):
+    """Runs the benchmarks on synthetic data and compares them to the
+    previous stored run
+    """
+    sizes = QUICK_SIZES if quick else SIZES
+    results = {}
+    results.update(bench_assess(sizes["assess"]))
+    results.update(bench_fit())
+    results.update(bench_scale(sizes["scale"]))
+    results.update(bench_eval(sizes["rows"]))
+
+    previous = sorted(RESULTS_DIR.glob("*.json"))
+    compare(results, json.loads(previous[-1].read_text()) if previous else {})
+    if save:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        path = Path(RESULTS_DIR, time.strftime("%Y%m%d-%H%M%S") + ".json")
+        path.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import attr
+import numpy as np
+import pandas as pd
+
+from src.utility import Utility
+
+# Resamples refitted per task of a worker, small so that the time budget is
+# checked often
+CHUNK = 8
+
+
+@attr.s
+class Bootstrap(object):
+    """
+    Fits of a SAUF on resampled data, see bootstrap
+    """
+
+    # Values at which the curves are evaluated
+    grid = attr.ib()
+    # One row per resample
+    points = attr.ib(repr=False)
+    curves = attr.ib(repr=False)
+    # Utilities of the alternatives scored, if any
+    scores = attr.ib(default=None, repr=False)
+    labels = attr.ib(default=None)
+
+    @property
+    def samples(self):
+        return len(self.points)
+
+    def _band(self, values, level):
+        tail = (1 - level) / 2 * 100
+        return np.percentile(values, [tail, 50, 100 - tail], axis=0)
+
+    def curve_band(self, level=0.9):
+        """
+        Return the lower, median and upper percentiles of the normalized
+        utility at every value of grid
+        """
+        lower, median, upper = self._band(self.curves, level)
+        return pd.DataFrame(
+            {"x": self.grid, "lower": lower, "median": median, "upper": upper}
+        )
+
+    def score_band(self, level=0.9):
+        """
+        Return the lower, median and upper percentiles of the utility of every
+        alternative scored
+        """
+        lower, median, upper = self._band(self.scores, level)
+        return pd.DataFrame(
+            {"lower": lower, "median": median, "upper": upper}, index=self.labels
+        )
+
+
+def _refit(utility, resamples, deadline=None):
+    """
+    Assess and fit utility on every row of resamples (indices into its data),
+    starting from its points and parameters, stopping once time.time()
+    passes deadline if given
+
+    Return a list of (points, fitted parameters)
+    """
+    start = utility.to_dict()["params"]
+    fits = []
+    for indices in resamples:
+        u = Utility(
+            name=utility.name,
+            optimal_fit=True,
+            data=np.asarray(utility.data)[indices],
+            is_cost=utility.is_cost,
+            method=utility.method,
+            family=utility.family,
+            interpolation=utility.interpolation,
+            points=utility.points,
+            params=dict(start),
+        )
+        u.assess()
+        u.fit()
+        fits.append((u.points, u.to_dict()["params"]))
+        if deadline is not None and time.time() >= deadline:
+            break
+    return fits
+
+
+def bootstrap(
+    utility, x=None, samples=1000, time_budget=None, workers=None, seed=None, grid=50
+):
+    """
+    Assess and fit an assessed and fitted SAUF again on resamples of its data,
+    over worker processes, each fit starting from the base one
+
+    Stops after samples resamples or, if given, once time_budget seconds are
+    spent, keeping the fits done by then: resamples are refitted by chunks of
+    CHUNK, no chunk is started past the budget and running ones stop at it.
+    x, an array of alternatives, is scored with every fit. A single worker
+    runs in the current process.
+
+    Return a Bootstrap
+    """
+    rng = np.random.default_rng(seed)
+    data = np.asarray(utility.data)
+    resamples = rng.integers(0, len(data), (samples, len(data)))
+    workers = workers or os.cpu_count()
+    chunks = (resamples[i : i + CHUNK] for i in range(0, samples, CHUNK))
+    # Wall clock, comparable across processes
+    deadline = None if time_budget is None else time.time() + time_budget
+    # Stats may not pickle, and the fit is not copied by attr.evolve
+    base = attr.evolve(utility, stats=None, params=utility.to_dict()["params"])
+    fits = []
+
+    def next_chunk():
+        # The first chunk always runs, so that there is at least one fit
+        if fits and deadline is not None and time.time() >= deadline:
+            return None
+        return next(chunks, None)
+
+    if workers == 1:
+        chunk = next_chunk()
+        while chunk is not None:
+            fits.extend(_refit(base, chunk, deadline))
+            chunk = next_chunk()
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # One chunk per worker, nothing queued beyond them
+            pending = set()
+            for _ in range(workers):
+                chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                pending.add(executor.submit(_refit, base, chunk, deadline))
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    fits.extend(future.result())
+                    chunk = next_chunk()
+                    if chunk is not None:
+                        pending.add(executor.submit(_refit, base, chunk, deadline))
+
+    points = np.array([fit[0] for fit in fits])
+    # All the fits are evaluated at once, with one row of parameters per fit
+    family = utility._family()
+    params = {
+        name: np.array([fit[1][name] for fit in fits])[:, None]
+        for name in family.params
+    }
+    # Every fit is normalized between its own worst and best points
+    lower = family.evaluate(params, points[:, :1])
+    upper = family.evaluate(params, points[:, -1:])
+
+    def normalized(values):
+        return (family.evaluate(params, values[None, :]) - lower) / (upper - lower)
+
+    grid = np.linspace(utility.worst, utility.best, grid)
+    result = Bootstrap(grid=grid, points=points, curves=normalized(grid))
+    if x is not None:
+        result.labels = list(x.index) if hasattr(x, "index") else None
+        result.scores = normalized(np.asarray(x, dtype=float))
+    return result
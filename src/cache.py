@@ -0,0 +1,117 @@
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import attr
+import numpy as np
+
+
+def _default_directory():
+    project_dir = Path(__file__).resolve().parents[1]
+    return Path(project_dir, "models/cache")
+
+
+@attr.s
+class FitCache(object):
+    """
+    On disk cache of assessed and fitted SAUFs, one JSON file per entry keyed
+    by a hash of what the fit depends on. The least recently used entries are
+    evicted once the cache grows over max_bytes
+    """
+
+    directory = attr.ib(factory=_default_directory, converter=Path)
+    max_bytes = attr.ib(default=10 * 2**20)
+
+    def key(self, utility):
+        """
+        Return the hash of the data (or the points when provided), method,
+        is_cost and model of the family of utility
+        """
+        values = utility.data if utility.optimal_fit else utility.points
+        digest = hashlib.sha256(np.ascontiguousarray(values, dtype=float).tobytes())
+        digest.update(
+            json.dumps(
+                [
+                    utility.optimal_fit,
+                    utility.method,
+                    utility.is_cost,
+                    utility._family().model,
+                ]
+            ).encode()
+        )
+        return digest.hexdigest()
+
+    def get(self, utility):
+        """
+        Set the cached points and params on utility
+
+        Return True when the entry exists
+        """
+        path = Path(self.directory, self.key(utility) + ".json")
+        try:
+            entry = json.loads(path.read_text())
+        except FileNotFoundError:
+            return False
+        # Reading counts as a use for the eviction, unless another process
+        # evicted the entry meanwhile
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        utility.points = np.array(entry["points"])
+        utility.params = entry["params"]
+        return True
+
+    def put(self, utility):
+        """
+        Store the points and fitted params of utility
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        d = utility.to_dict()
+        entry = {"points": d["points"], "params": d["params"]}
+        path = Path(self.directory, self.key(utility) + ".json")
+        # Readers in other processes never see a partly written entry
+        fd, temporary = tempfile.mkstemp(suffix=".tmp", dir=self.directory)
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(entry, f)
+            os.replace(temporary, path)
+        except BaseException:
+            os.remove(temporary)
+            raise
+        self.evict()
+
+    def evict(self):
+        """
+        Remove the least recently used entries until the cache fits in
+        max_bytes
+        """
+        # Other processes may evict the same entries concurrently
+        entries = []
+        for path in self.directory.glob("*.json"):
+            try:
+                entries.append((path.stat(), path))
+            except FileNotFoundError:
+                continue
+        entries.sort(key=lambda entry: entry[0].st_mtime)
+        size = sum(stat.st_size for stat, _ in entries)
+        for stat, path in entries:
+            if size <= self.max_bytes:
+                break
+            size -= stat.st_size
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def assess_and_fit(self, utility):
+        """
+        Load utility from the cache, or assess, fit and store it
+        """
+        if not self.get(utility):
+            utility.assess()
+            utility.fit()
+            self.put(utility)
+        return utility
@@ -1,8 +1,35 @@
+import os
+import tempfile
 import pandas as pd
 from pathlib import Path
 
 
-def load_data():
+def load_data(columns=None, memory_map=True):
+    """
+    Load the processed data, only the given columns if any
 
+    With pyarrow installed, the data is read from a Parquet copy of the CSV,
+    memory mapped if memory_map. The copy is written on first load and
+    whenever the CSV is newer, to a temporary file moved into place so that
+    concurrent readers never see it half written.
+    """
     project_dir = Path(__file__).resolve().parents[2]
-    return pd.read_csv(Path(project_dir, "data/processed/health_infrastructure.csv"))
+    path = Path(project_dir, "data/processed/health_infrastructure.csv")
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return pd.read_csv(path, usecols=columns)
+
+    parquet = path.with_suffix(".parquet")
+    if path.exists() and (
+        not parquet.exists() or parquet.stat().st_mtime < path.stat().st_mtime
+    ):
+        fd, temporary = tempfile.mkstemp(suffix=".parquet", dir=parquet.parent)
+        os.close(fd)
+        try:
+            pd.read_csv(path).to_parquet(temporary, index=False)
+            os.replace(temporary, parquet)
+        except BaseException:
+            os.remove(temporary)
+            raise
+    return pd.read_parquet(parquet, columns=columns, memory_map=memory_map)
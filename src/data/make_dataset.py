@@ -5,59 +5,144 @@ from pathlib import Path
 from dotenv import find_dotenv, load_dotenv
 import pandas as pd
 
+DROPPED_COLUMNS = [
+    "Indicators: Sources",
+    "Indicators: Unit",
+    "Indicators: Methodology",
+    "Indicators: Comment",
+    "Indicators: Key",
+    "Regions: Key",
+    "Regions: ISO",
+    "Scale: Key",
+    "Scale: Name",
+    "Frequency",
+]
+RENAMED_COLUMNS = {
+    "Facts: Value": "value",
+    "Indicators: Full name": "indicator",
+    "Regions: Name": "region",
+    "Date": "date",
+}
+LAST_UPDATE = "Indicators: Last Update"
+# Read with a fixed type, not one inferred from every chunk
+VALUE_TYPES = {"Facts: Value": float}
+
+
+def process(df, last_update):
+    """ Keeps the rows dated before last_update, the earliest update of the
+        indicators, with their year as date
+    """
+    dates = pd.to_datetime(df["Date"])
+    keep = dates < last_update
+    return (
+        df.loc[keep]
+        .drop(columns=[LAST_UPDATE], errors="ignore")
+        .assign(Date=dates[keep].dt.year)
+        .rename(columns=RENAMED_COLUMNS)
+    )
+
+
+def read_chunks(input_filepath, columns, chunksize):
+    """ Reads the given columns of a CSV or Parquet file by chunks of rows
+    """
+    types = {name: t for name, t in VALUE_TYPES.items() if name in columns}
+    if Path(input_filepath).suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        batches = pq.ParquetFile(input_filepath).iter_batches(
+            batch_size=chunksize, columns=columns
+        )
+        return (batch.to_pandas().astype(types) for batch in batches)
+    return pd.read_csv(
+        input_filepath, usecols=columns, chunksize=chunksize, dtype=types
+    )
+
+
+def stream(input_filepath, output_filepath, chunksize, parquet=False):
+    """ Processes a CSV or Parquet file chunk by chunk, in two passes: the
+        first one finds the earliest update of the indicators, the second one
+        filters the rows and appends them to the output, and to a Parquet
+        copy of it if parquet
+    """
+    if Path(input_filepath).suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        names = pq.read_schema(input_filepath).names
+    else:
+        names = pd.read_csv(input_filepath, nrows=0).columns
+    columns = [name for name in names if name not in DROPPED_COLUMNS]
+
+    last_update = min(
+        pd.to_datetime(chunk[LAST_UPDATE]).min()
+        for chunk in read_chunks(input_filepath, [LAST_UPDATE], chunksize)
+    )
+    header = True
+    writer = None
+    for chunk in read_chunks(input_filepath, columns, chunksize):
+        data = process(chunk, last_update)
+        data.to_csv(
+            output_filepath, mode="w" if header else "a", header=header, index=False
+        )
+        header = False
+        if parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            if writer is None:
+                # Explicit types, those inferred from a chunk may not fit the
+                # next ones
+                schema = pa.schema(
+                    [
+                        (
+                            name,
+                            {"value": pa.float64(), "date": pa.int64()}.get(
+                                name, pa.string()
+                            ),
+                        )
+                        for name in data.columns
+                    ]
+                )
+                writer = pq.ParquetWriter(
+                    str(Path(output_filepath).with_suffix(".parquet")), schema
+                )
+            table = pa.Table.from_pandas(data, preserve_index=False)
+            writer.write_table(table.cast(writer.schema))
+    if writer is not None:
+        writer.close()
+
 
 @click.command()
 @click.argument("input_filepath", type=click.Path(exists=True))
 @click.argument("output_filepath", type=click.Path())
-def main(input_filepath, output_filepath):
+@click.option(
+    "--chunksize",
+    default=100000,
+    help="Rows read at once from CSV and Parquet inputs",
+)
+@click.option(
+    "--parquet",
+    is_flag=True,
+    help="Also write the output as Parquet, next to the CSV",
+)
+def main(input_filepath, output_filepath, chunksize, parquet):
     """ Runs data processing scripts to turn raw data from (../raw) into
         cleaned data ready to be analyzed (saved in ../processed).
+
+        CSV and Parquet inputs are streamed by chunks, other inputs are read
+        as Excel files.
     """
     logger = logging.getLogger(__name__)
     logger.info("making final data set from raw data")
-    data = (
-        pd.read_excel(input_filepath)
-        .pipe(
-            lambda df: df.drop(
-                columns=[
-                    "Indicators: Sources",
-                    "Indicators: Unit",
-                    "Indicators: Methodology",
-                    "Indicators: Comment",
-                    "Indicators: Key",
-                    "Regions: Key",
-                    "Regions: ISO",
-                    "Scale: Key",
-                    "Scale: Name",
-                    "Frequency",
-                ]
-            )
-        )
-        .pipe(
-            lambda df: df.assign(
-                **{
-                    "Indicators: Last Update": df["Indicators: Last Update"].apply(
-                        pd.to_datetime
-                    ),
-                    "Date": df["Date"].apply(pd.to_datetime),
-                }
-            )
-        )
-        .pipe(lambda df: df.loc[(df["Date"] < df["Indicators: Last Update"].min())])
-        .pipe(lambda df: df.assign(**{"Date": df["Date"].apply(lambda x: x.year)}))
-        .pipe(lambda df: df.drop(columns=["Indicators: Last Update"]))
-        .pipe(
-            lambda df: df.rename(
-                columns={
-                    "Facts: Value": "value",
-                    "Indicators: Full name": "indicator",
-                    "Regions: Name": "region",
-                    "Date": "date",
-                }
-            )
-        )
+    if Path(input_filepath).suffix in (".csv", ".parquet"):
+        stream(input_filepath, output_filepath, chunksize, parquet)
+        return
+    data = pd.read_excel(
+        input_filepath, usecols=lambda column: column not in DROPPED_COLUMNS
     )
+    data = process(data, pd.to_datetime(data[LAST_UPDATE]).min())
     data.to_csv(output_filepath, index=False)
+    if parquet:
+        data.to_parquet(Path(output_filepath).with_suffix(".parquet"), index=False)
 
 
 if __name__ == "__main__":
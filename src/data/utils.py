@@ -1,9 +1,109 @@
+from collections.abc import Iterable
+
+import attr
+import numpy as np
+import pandas as pd
+
+POPULATION = "Estimate of the population on July 1st"
+
+
+@attr.s
+class IndicatorStore(object):
+    """
+    Long format frame indexed once by (indicator, date), to look up many
+    indicators and years without scanning the whole frame
+    """
+
+    df = attr.ib()
+
+    def __attrs_post_init__(self):
+        # Positions of the rows of every (indicator, date)
+        self.positions = self.df.groupby(["indicator", "date"], sort=False).indices
+        self.panels = {}
+
+    def rows(self, indicators, years):
+        """
+        Return the rows of the given indicators and years, in their original
+        order
+        """
+        empty = np.array([], dtype=int)
+        positions = [
+            self.positions.get((indicator, year), empty)
+            for indicator in indicators
+            for year in years
+        ]
+        return self.df.iloc[np.sort(np.concatenate(positions))]
+
+    def panel(self, indicators, years, per_capita=POPULATION, per=1000):
+        """
+        Return a Panel of indicators for years, per the given number of
+        inhabitants unless per_capita is None. Panels are cached
+        """
+        key = (tuple(indicators), tuple(years), per_capita, per)
+        if key not in self.panels:
+            self.panels[key] = Panel.build(self, indicators, years, per_capita, per)
+        return self.panels[key]
+
+
+@attr.s
+class Panel(object):
+    """
+    Dense float64 array of indicators, regions x indicators x years
+    """
+
+    regions = attr.ib()
+    indicators = attr.ib()
+    years = attr.ib()
+    values = attr.ib()
+
+    @classmethod
+    def build(cls, store, indicators, years, per_capita=POPULATION, per=1000):
+        indicators, years = list(indicators), list(years)
+        columns = indicators + ([per_capita] if per_capita else [])
+        rows = store.rows(columns, years)
+        r, regions = pd.factorize(rows["region"], sort=True)
+        i = pd.Index(columns).get_indexer(rows["indicator"])
+        y = pd.Index(years).get_indexer(rows["date"])
+
+        values = np.full((len(regions), len(columns), len(years)), np.nan)
+        values[r, i, y] = rows["value"].to_numpy(dtype=float)
+        if per_capita:
+            # Population is the last indicator, divided out in one broadcast
+            values = values[:, :-1] / values[:, -1:] * per
+        return cls(
+            regions=list(regions), indicators=indicators, years=years, values=values
+        )
+
+    def frame(self, year):
+        """
+        Return the regions x indicators frame of year, e.g. for fit_many
+        """
+        return pd.DataFrame(
+            self.values[:, :, self.years.index(year)],
+            index=pd.Index(self.regions, name="region"),
+            columns=self.indicators,
+        )
+
+
 def get_indicator(df, indicators, year, values_only=True):
+    """
+    Return the values of indicators for year, df being a long format frame or
+    an IndicatorStore built from one. Several years can be passed as any
+    iterable but a string (a list, a range, an array...), their date is then
+    kept
+    """
     if isinstance(indicators, str):
         indicators = [indicators]
-    df = df.pipe(
-        lambda df: df.loc[(df["date"] == year) & (df["indicator"].isin(indicators))]
-    ).pipe(lambda df: df.drop(columns=["date"]))
+    if isinstance(year, Iterable) and not isinstance(year, str):
+        years = list(year)
+    else:
+        years = [year]
+    if isinstance(df, IndicatorStore):
+        df = df.rows(indicators, years)
+    else:
+        df = df.loc[(df["date"].isin(years)) & (df["indicator"].isin(indicators))]
+    if len(years) == 1:
+        df = df.drop(columns=["date"])
     if values_only:
         return df.loc[:, "value"]
     else:
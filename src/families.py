@@ -0,0 +1,434 @@
+import numpy as np
+
+from src.fitting import MODEL, assess_exponential, fit_exponential
+
+
+class Family(object):
+    """
+    A parametric form of utility function: its vectorized evaluation, the
+    derivatives of it with respect to the parameters and starting values
+    for fitting it to assessment points
+
+    Parameter values are passed as a dict, either of floats or of arrays
+    broadcasting against x, e.g. one row per function to score many at once
+    """
+
+    name = None
+    # Expression of the model, for display and cache keys
+    model = None
+    # Parameter names, and those held fixed when fitting
+    params = ()
+    fixed = ()
+
+    def evaluate(self, v, x):
+        raise NotImplementedError
+
+    def jacobian(self, v, x):
+        """
+        Return the derivatives of evaluate with respect to the parameters not
+        fixed, keyed by name
+        """
+        raise NotImplementedError
+
+    def start(self, points, utilities):
+        """
+        Return starting values of the parameters for points
+        """
+        raise NotImplementedError
+
+    def solve(self, points, utilities, max_iter=50, tol=1e-10):
+        """
+        Least squares fit of utilities at points by Levenberg-Marquardt
+        iterations from start, with the analytic jacobian
+
+        Return the values of the parameters, the sum of squared residuals and
+        the number of iterations
+        """
+        names = [name for name in self.params if name not in self.fixed]
+        v = self.start(points, utilities)
+        residuals = self.evaluate(v, points) - utilities
+        chisqr = residuals @ residuals
+        damping = 1e-3
+        for iteration in range(1, max_iter + 1):
+            derivatives = self.jacobian(v, points)
+            jacobian = np.column_stack([derivatives[name] for name in names])
+            hessian = jacobian.T @ jacobian
+            gradient = jacobian.T @ residuals
+            try:
+                step = np.linalg.solve(
+                    hessian + damping * np.diag(np.diag(hessian) + 1e-12), -gradient
+                )
+            except np.linalg.LinAlgError:
+                break
+            trial = dict(v)
+            for name, delta in zip(names, step):
+                trial[name] = v[name] + delta
+            with np.errstate(over="ignore", invalid="ignore"):
+                trial_residuals = self.evaluate(trial, points) - utilities
+            trial_chisqr = trial_residuals @ trial_residuals
+            if np.isfinite(trial_chisqr) and trial_chisqr < chisqr:
+                converged = chisqr - trial_chisqr <= tol * (1 + chisqr)
+                v, residuals, chisqr = trial, trial_residuals, trial_chisqr
+                damping /= 10
+                if converged:
+                    break
+            else:
+                damping *= 10
+                if damping > 1e10:
+                    break
+        return v, chisqr, iteration
+
+    def assess(self, worst, best, utilities):
+        """
+        Exact assessment of many functions at once, worst and best being
+        arrays, for the families having one
+
+        Return the stacked points, the values of the parameters as arrays
+        keyed by name and whether every function was solved
+        """
+        return None, None, np.zeros(len(worst), dtype=bool)
+
+
+def _linear(f, y):
+    """
+    Return the intercept and slope of the least squares fit of y on f, and
+    the sum of squared residuals
+    """
+    f_mean, y_mean = f.mean(), y.mean()
+    variance = ((f - f_mean) ** 2).sum()
+    slope = ((f - f_mean) * (y - y_mean)).sum() / variance if variance else 0.0
+    intercept = y_mean - slope * f_mean
+    residuals = intercept + slope * f - y
+    return intercept, slope, residuals @ residuals
+
+
+class Exponential(Family):
+    """
+    Constant absolute risk aversion, the default family, fitted in closed form
+    by src.fitting
+    """
+
+    name = "exponential"
+    model = MODEL
+    params = ("a", "b", "c")
+    # b ** (-c * x) only depends on c * log(b), varying both would leave the
+    # jacobian rank deficient
+    fixed = ("b",)
+
+    def evaluate(self, v, x):
+        # exp is cheaper than a power of an arbitrary base
+        return v["a"] + np.exp(-v["c"] * np.log(v["b"]) * x)
+
+    def jacobian(self, v, x):
+        power = np.exp(-v["c"] * np.log(v["b"]) * x)
+        return {
+            "a": np.ones_like(power),
+            "b": -v["c"] * x * power / v["b"],
+            "c": -x * np.log(v["b"]) * power,
+        }
+
+    def start(self, points, utilities):
+        return self.solve(points, utilities)[0]
+
+    def solve(self, points, utilities, max_iter=50, tol=1e-10):
+        a, b, c, chisqr, iterations = fit_exponential(
+            points, utilities, max_iter=max_iter, tol=tol, full_output=True
+        )
+        return {"a": a[0], "b": b[0], "c": c[0]}, chisqr[0], iterations
+
+    def assess(self, worst, best, utilities):
+        points, a, b, c, solved = assess_exponential(worst, best, utilities)
+        return points, {"a": a, "b": b, "c": c}, solved
+
+
+class Power(Family):
+    """
+    Constant relative risk aversion, for positive indicators
+    """
+
+    name = "power"
+    model = "a + b * x ** c"
+    params = ("a", "b", "c")
+    EXPONENTS = (-2, -1, -0.5, 0.25, 0.5, 0.75, 1.5, 2, 3)
+
+    def evaluate(self, v, x):
+        return v["a"] + v["b"] * x ** v["c"]
+
+    def jacobian(self, v, x):
+        power = x ** v["c"]
+        return {
+            "a": np.ones_like(power),
+            "b": power,
+            "c": v["b"] * power * np.log(x),
+        }
+
+    def start(self, points, utilities):
+        points = np.asarray(points, dtype=float)
+        if np.any(points <= 0):
+            raise ValueError(
+                "The power family is only defined for positive values, got "
+                "points {}".format(points.tolist())
+            )
+        # a and b are linear, solved for every exponent of a coarse grid
+        fits = [_linear(points**c, utilities) + (c,) for c in self.EXPONENTS]
+        fits = [fit for fit in fits if np.isfinite(fit[2])]
+        a, b, _, c = min(fits, key=lambda fit: fit[2])
+        return {"a": a, "b": b, "c": c}
+
+
+class Linear(Family):
+    """
+    Risk neutral utility, interpolated exactly by evenly spaced points
+    """
+
+    name = "linear"
+    model = "a + b * x"
+    params = ("a", "b")
+
+    def evaluate(self, v, x):
+        return v["a"] + v["b"] * x
+
+    def jacobian(self, v, x):
+        return {"a": np.ones_like(x), "b": x + np.zeros_like(v["b"])}
+
+    def start(self, points, utilities):
+        a, b, _ = _linear(points, utilities)
+        return {"a": a, "b": b}
+
+    def solve(self, points, utilities, max_iter=50, tol=1e-10):
+        a, b, chisqr = _linear(points, utilities)
+        return {"a": a, "b": b}, chisqr, 0
+
+    def assess(self, worst, best, utilities):
+        span = best - worst
+        solved = span != 0
+        span = np.where(solved, span, 1)
+        points = worst[:, None] + span[:, None] * utilities
+        return points, {"a": -worst / span, "b": 1 / span}, solved
+
+
+class Logistic(Family):
+    """
+    S shaped utility, risk averse above its midpoint d and risk seeking below
+    """
+
+    name = "logistic"
+    model = "a + b / (1 + exp(-c * (x - d)))"
+    params = ("a", "b", "c", "d")
+    # Steepness relative to the span of the points
+    STEEPNESS = (1, 2, 4, 8, 16)
+
+    def _sigmoid(self, v, x):
+        with np.errstate(over="ignore"):
+            return 1 / (1 + np.exp(-v["c"] * (x - v["d"])))
+
+    def evaluate(self, v, x):
+        return v["a"] + v["b"] * self._sigmoid(v, x)
+
+    def jacobian(self, v, x):
+        s = self._sigmoid(v, x)
+        slope = v["b"] * s * (1 - s)
+        return {
+            "a": np.ones_like(s),
+            "b": s,
+            "c": slope * (x - v["d"]),
+            "d": -slope * v["c"],
+        }
+
+    def start(self, points, utilities):
+        # a and b are linear, solved for midpoints at the middle points and a
+        # grid of steepness, oriented from worst to best
+        span = points[-1] - points[0]
+        fits = []
+        for d in points[1:4]:
+            for steepness in self.STEEPNESS:
+                c = steepness / span if span else 1.0
+                s = self._sigmoid({"c": c, "d": d}, points)
+                fits.append(_linear(s, utilities) + (c, d))
+        a, b, _, c, d = min(fits, key=lambda fit: fit[2])
+        return {"a": a, "b": b, "c": c, "d": d}
+
+
+class _Knots(object):
+    """
+    Helpers of the functions of utilities y_i at knots x_i, the assessment
+    points, constant beyond the first and last knots
+    """
+
+    params = tuple("x_{}".format(i) for i in range(5)) + tuple(
+        "y_{}".format(i) for i in range(5)
+    )
+
+    def _knots(self, v):
+        return (
+            np.array([v["x_{}".format(i)] for i in range(5)]),
+            np.array([v["y_{}".format(i)] for i in range(5)]),
+        )
+
+    def _shares(self, v, x):
+        """
+        Return how far x is along every segment, clipped between 0 and 1
+        """
+        knots = [v["x_{}".format(i)] for i in range(5)]
+        direction = np.sign(knots[-1] - knots[0])
+        shares = []
+        for left, right in zip(knots[:-1], knots[1:]):
+            width = right - left
+            with np.errstate(divide="ignore", invalid="ignore"):
+                share = np.clip((x - left) / width, 0, 1)
+            # A vertical segment is a step
+            shares.append(np.where(width == 0, (x - left) * direction >= 0, share))
+        return shares
+
+    def _segments(self, knots, x):
+        """
+        Yield every segment and how far x is along it, between 0 and 1, for a
+        single function of distinct knots. The share is computed in place in
+        one buffer, cheaper than the search of np.interp over unsorted x
+        """
+        share = np.empty(np.shape(x))
+        for i, (left, right) in enumerate(zip(knots[:-1], knots[1:])):
+            np.clip(x, min(left, right), max(left, right), out=share)
+            share -= left
+            share /= right - left
+            yield i, share
+
+    def _single(self, knots):
+        return knots.ndim == 1 and np.all(knots[1:] != knots[:-1])
+
+    def start(self, points, utilities):
+        v = {"x_{}".format(i): point for i, point in enumerate(points)}
+        v.update({"y_{}".format(i): value for i, value in enumerate(utilities)})
+        return v
+
+
+class PiecewiseLinear(_Knots, Family):
+    """
+    Straight segments between knots x_i of utilities y_i. The knots are held
+    at the points and the utilities fitted, which interpolates the points
+    exactly
+    """
+
+    name = "piecewise_linear"
+    model = "interp(x, [x_0, ..., x_4], [y_0, ..., y_4])"
+    fixed = _Knots.params[:5]
+
+    def evaluate(self, v, x):
+        knots, values = self._knots(v)
+        rises = np.diff(values, axis=0)
+        if self._single(knots):
+            y = np.full(np.shape(x), values[0])
+            for i, share in self._segments(knots, x):
+                share *= rises[i]
+                y += share
+            return y
+        # Every segment adds its rise up to x
+        y = v["y_0"]
+        for i, share in enumerate(self._shares(v, x)):
+            y = y + rises[i] * share
+        return y
+
+    def jacobian(self, v, x):
+        # Hat functions of the knots, differences of consecutive shares
+        shares = self._shares(v, x)
+        shares = [np.ones_like(shares[0], dtype=float)] + shares
+        shares.append(np.zeros_like(shares[0]))
+        return {"y_{}".format(i): shares[i] - shares[i + 1] for i in range(5)}
+
+    def solve(self, points, utilities, max_iter=50, tol=1e-10):
+        return self.start(points, utilities), 0.0, 0
+
+
+def _pchip_slopes(widths, deltas):
+    """
+    Return the slopes at the knots keeping a cubic interpolant monotone
+    between them (Fritsch and Carlson, as scipy's PchipInterpolator), from
+    the widths and slopes of the segments along the first axis
+    """
+    if len(widths) == 1:
+        return np.stack([deltas[0], deltas[0]])
+    # Weighted harmonic mean of the slopes around the inner knots, 0 at
+    # extrema
+    w1 = 2 * widths[1:] + widths[:-1]
+    w2 = widths[1:] + 2 * widths[:-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        inner = (w1 + w2) / (w1 / deltas[:-1] + w2 / deltas[1:])
+    inner = np.where(deltas[:-1] * deltas[1:] > 0, inner, 0)
+
+    def end(h0, h1, d0, d1):
+        # Three points estimate, kept of the sign of the end segment
+        with np.errstate(divide="ignore", invalid="ignore"):
+            m = ((2 * h0 + h1) * d0 - h0 * d1) / (h0 + h1)
+        m = np.where(np.sign(m) != np.sign(d0), 0, m)
+        return np.where(
+            (np.sign(d0) != np.sign(d1)) & (np.abs(m) > 3 * np.abs(d0)), 3 * d0, m
+        )
+
+    first = end(widths[0], widths[1], deltas[0], deltas[1])
+    last = end(widths[-1], widths[-2], deltas[-1], deltas[-2])
+    return np.concatenate([first[None], inner, last[None]])
+
+
+class Pchip(_Knots):
+    """
+    Monotone cubic interpolation of the knots. Not a Family: it only scores
+    the points, there is nothing to fit
+    """
+
+    name = "pchip"
+    model = "pchip(x, [x_0, ..., x_4], [y_0, ..., y_4])"
+
+    def _cubics(self, knots, values):
+        """
+        Return the coefficients a, b and c of t * (a + t * (b + t * c)), the
+        rise of every segment up to the share t of it
+        """
+        widths = np.diff(knots, axis=0)
+        rises = np.diff(values, axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            deltas = np.where(widths != 0, rises / widths, 0)
+        slopes = _pchip_slopes(widths, deltas)
+        left, right = widths * slopes[:-1], widths * slopes[1:]
+        return left, 3 * rises - 2 * left - right, left + right - 2 * rises
+
+    def evaluate(self, v, x):
+        knots, values = self._knots(v)
+        a, b, c = self._cubics(knots, values)
+        if self._single(knots):
+            y = np.full(np.shape(x), values[0])
+            cubic = np.empty(np.shape(x))
+            for i, t in self._segments(knots, x):
+                np.multiply(t, c[i], out=cubic)
+                cubic += b[i]
+                cubic *= t
+                cubic += a[i]
+                cubic *= t
+                y += cubic
+            return y
+        # Equal knots are steps, as for PiecewiseLinear
+        y = v["y_0"]
+        for i, t in enumerate(self._shares(v, x)):
+            y = y + t * (a[i] + t * (b[i] + t * c[i]))
+        return y
+
+
+# Families of utility functions by name
+FAMILIES = {
+    family.name: family
+    for family in (Exponential(), Power(), Linear(), Logistic(), PiecewiseLinear())
+}
+
+
+def register(family):
+    """
+    Make family available to Utility by its name
+
+    Return family
+    """
+    FAMILIES[family.name] = family
+    return family
+
+
+# Interpolations of the points scoring a Utility instead of its family, by
+# the name given to Utility.interpolation
+INTERPOLATIONS = {"linear": FAMILIES["piecewise_linear"], "pchip": Pchip()}
@@ -0,0 +1,208 @@
+import numpy as np
+
+# Form of the utility functions fitted here
+MODEL = "a + b ** (-c * x)"
+
+# Starting grid for the rate, expressed relative to the span of x so that it
+# does not depend on the unit of the indicator
+RATE_GRID = np.concatenate([-np.geomspace(30, 1e-2, 40), np.geomspace(1e-2, 30, 40)])
+
+
+def _project(rate, x, y):
+    """
+    Return the optimal intercept and the residuals of a + exp(-rate * x)
+    for every row of x, the intercept being solved in closed form
+    """
+    with np.errstate(over="ignore", invalid="ignore"):
+        e = np.exp(-rate[:, None] * x)
+        a = (y - e).mean(axis=1)
+        residuals = a[:, None] + e - y
+    return a, e, residuals
+
+
+def _chisqr(residuals):
+    chisqr = (residuals**2).sum(axis=1)
+    chisqr[~np.isfinite(chisqr)] = np.inf
+    return chisqr
+
+
+def fit_exponential(x, y, max_iter=50, tol=1e-10, full_output=False):
+    """
+    Least squares fit of y = a + b ** (-c * x) for every row of x
+
+    b ** (-c * x) only depends on the product c * log(b), the model is then
+    a + exp(-rate * x): a is linear and solved in closed form for a given rate
+    (variable projection), the rate is found by a grid search followed by
+    Gauss-Newton iterations on the projected problem.
+
+    Return a tuple of arrays (a, b, c, chisqr), one value per row of x,
+    followed by the number of Gauss-Newton iterations if full_output
+    """
+    x = np.atleast_2d(np.asarray(x, dtype=float))
+    y = np.asarray(y, dtype=float)
+    span = x.max(axis=1) - x.min(axis=1)
+    span[span == 0] = 1
+
+    # Grid search, all rows and all candidate rates at once
+    grid = RATE_GRID[None, :] / span[:, None]
+    candidates = grid.ravel()
+    _, _, residuals = _project(candidates, np.repeat(x, RATE_GRID.size, axis=0), y)
+    chisqr = _chisqr(residuals).reshape(grid.shape)
+    rate = grid[np.arange(len(x)), chisqr.argmin(axis=1)]
+
+    a, e, residuals = _project(rate, x, y)
+    chisqr = _chisqr(residuals)
+    active = np.isfinite(chisqr)
+    iterations = 0
+    for iterations in range(1, max_iter + 1):
+        # Jacobian of the projected residuals with respect to the rate
+        xe = x * e
+        jac = xe.mean(axis=1, keepdims=True) - xe
+        jj = (jac**2).sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = -(jac * residuals).sum(axis=1) / jj
+        step[~active | ~np.isfinite(step)] = 0
+
+        # Halve the step wherever it does not decrease the sum of squares
+        accepted = np.zeros(len(x), dtype=bool)
+        for _ in range(20):
+            trial = rate + step
+            t_a, t_e, t_residuals = _project(trial, x, y)
+            t_chisqr = _chisqr(t_residuals)
+            better = ~accepted & (t_chisqr <= chisqr)
+            rate[better] = trial[better]
+            a[better] = t_a[better]
+            e[better] = t_e[better]
+            residuals[better] = t_residuals[better]
+            chisqr[better] = t_chisqr[better]
+            accepted |= better
+            step[~accepted] /= 2
+            if accepted.all():
+                break
+
+        converged = np.abs(step) <= tol * (np.abs(rate) + 1 / span)
+        active &= accepted & ~converged
+        if not active.any():
+            break
+
+    # Written back as a + b ** (-c * x) with b = e
+    if full_output:
+        return a, np.full_like(rate, np.e), rate, chisqr, iterations
+    return a, np.full_like(rate, np.e), rate, chisqr
+
+
+def assess_exponential(worst, best, utilities, max_iter=200):
+    """
+    Assessment points of a + b ** (-c * x) passing exactly through worst (0)
+    and best (1), for arrays of worst and best values
+
+    The model interpolates the points exactly once its rate solves
+    exp(-rate * best) - exp(-rate * worst) = 1, found by bisection for all
+    pairs at once, the middle points are then the inverse of the model at the
+    given utilities.
+
+    Return a tuple (points, a, b, c, solved), solved being False where no
+    such rate exists (e.g. decreasing utility over positive values)
+    """
+    worst = np.asarray(worst, dtype=float)
+    best = np.asarray(best, dtype=float)
+    utilities = np.asarray(utilities, dtype=float)
+    span = best - worst
+    direction = -np.sign(span)
+    distance = np.abs(span)
+
+    def gap(magnitude):
+        # log(exp(-rate * best) - exp(-rate * worst)), zero at the root
+        with np.errstate(over="ignore", divide="ignore", invalid="ignore"):
+            return -direction * magnitude * best + np.log1p(
+                -np.exp(-magnitude * distance)
+            )
+
+    with np.errstate(divide="ignore"):
+        high = 1 / distance
+    # Grow the upper bracket until the gap changes sign
+    for _ in range(max_iter):
+        growing = gap(high) <= 0
+        if not growing.any():
+            break
+        high[growing] *= 2
+    solved = (gap(high) > 0) & (distance > 0) & np.isfinite(high)
+
+    low = np.zeros_like(high)
+    high = np.where(solved, high, 0)
+    for _ in range(max_iter):
+        middle = (low + high) / 2
+        above = gap(middle) > 0
+        high = np.where(above, middle, high)
+        low = np.where(above, low, middle)
+
+    rate = direction * (low + high) / 2
+    with np.errstate(over="ignore", divide="ignore", invalid="ignore"):
+        a = -np.exp(-rate * worst)
+        points = -np.log(utilities[None, :] - a[:, None]) / rate[:, None]
+    points[:, 0] = worst
+    points[:, -1] = best
+    return points, a, np.full_like(rate, np.e), rate, solved
+
+
+def solve_master_equation(scaling_constants, xtol=1e-12):
+    """
+    Return the k of a multiplicative utility function, the non null root of
+    1 + k = prod(1 + k * k_i)
+
+    The root is in (-1, 0) when the scaling constants sum above 1 and in
+    (0, inf) when they sum below 1, it is bracketed accordingly and refined
+    with Brent's method. The equation is solved for log(1 + k) in log space,
+    divided by it to remove the trivial root, which keeps it stable for many
+    attributes even when k gets extremely close to -1.
+    """
+    from scipy.optimize import brentq
+
+    scaling_constants = np.asarray(scaling_constants, dtype=float)
+    total = scaling_constants.sum()
+    if len(scaling_constants) < 2 or np.isclose(total, 1):
+        return 0.0
+
+    def equation(t):
+        return np.log1p(np.expm1(t) * scaling_constants).sum() / t - 1
+
+    # Sign of log(1 + k), the bracket starts next to 0 and grows outwards
+    side = -1.0 if total > 1 else 1.0
+    near, far = side * np.finfo(float).eps, side
+    while np.sign(equation(far)) == np.sign(equation(near)):
+        near, far = far, far * 2
+    return float(np.expm1(brentq(equation, near, far, xtol=xtol)))
+
+
+def solve_master_equations(scaling_constants, max_iter=100):
+    """
+    Vectorized solve_master_equation, for every row of scaling constants
+
+    Rows are bracketed the same way then bisected together on log(1 + k).
+    Return an array of k, one per row
+    """
+    scaling_constants = np.atleast_2d(np.asarray(scaling_constants, dtype=float))
+    total = scaling_constants.sum(axis=1)
+    null = np.isclose(total, 1) | (scaling_constants.shape[1] < 2)
+
+    def equation(t):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return (
+                np.log1p(np.expm1(t)[:, None] * scaling_constants).sum(axis=1) / t - 1
+            )
+
+    side = np.where(total > 1, -1.0, 1.0)
+    near, far = side * np.finfo(float).eps, side.copy()
+    for _ in range(max_iter):
+        growing = ~null & (np.sign(equation(far)) == np.sign(equation(near)))
+        if not growing.any():
+            break
+        near[growing], far[growing] = far[growing], far[growing] * 2
+
+    sign_near = np.sign(equation(near))
+    for _ in range(max_iter):
+        middle = (near + far) / 2
+        same = np.sign(equation(middle)) == sign_near
+        near = np.where(same, middle, near)
+        far = np.where(same, far, middle)
+    return np.where(null, 0.0, np.expm1((near + far) / 2))
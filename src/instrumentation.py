@@ -0,0 +1,97 @@
+import logging
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+import attr
+
+logger = logging.getLogger(__name__)
+
+
+@attr.s
+class Stats(object):
+    """
+    Counters and timings of a Utility, opt-in by passing stats=Stats()
+
+    Every finished phase (assess, fit, scale, eval) is logged when log is
+    True and passed to callback(phase, stats) when provided
+    """
+
+    # Evaluations of the assess objective
+    objective_calls = attr.ib(default=0)
+    # Gauss-Newton iterations of the inner fits of assess
+    inner_iterations = attr.ib(default=0)
+    # Function evaluations of the minimize of fit
+    fit_evaluations = attr.ib(default=0)
+    # Cumulated wall time by phase, in seconds
+    wall_time = attr.ib(factory=dict)
+    # Whether the last run of a phase converged
+    converged = attr.ib(factory=dict)
+    log = attr.ib(default=False)
+    callback = attr.ib(default=None, repr=False)
+    _running = attr.ib(factory=set, repr=False)
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Time the block as phase name, nested runs of a phase (e.g. eval on
+        the saufs of a MAUF) are counted once
+        """
+        if name in self._running:
+            yield
+            return
+        self._running.add(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._running.discard(name)
+            elapsed = time.perf_counter() - start
+            self.wall_time[name] = self.wall_time.get(name, 0) + elapsed
+            self.emit(name, elapsed)
+
+    def merge(self, other):
+        """
+        Add the counts and timings of other, e.g. from a worker process, and
+        emit its phases
+        """
+        self.objective_calls += other.objective_calls
+        self.inner_iterations += other.inner_iterations
+        self.fit_evaluations += other.fit_evaluations
+        self.converged.update(other.converged)
+        for name, elapsed in other.wall_time.items():
+            self.wall_time[name] = self.wall_time.get(name, 0) + elapsed
+            self.emit(name, elapsed)
+
+    def emit(self, name, elapsed):
+        if self.log:
+            logger.info(
+                "%s: %.6fs, converged: %s, objective calls: %d, "
+                "inner iterations: %d, fit evaluations: %d",
+                name,
+                elapsed,
+                self.converged.get(name),
+                self.objective_calls,
+                self.inner_iterations,
+                self.fit_evaluations,
+            )
+        if self.callback is not None:
+            self.callback(name, self)
+
+
+def timed(phase):
+    """
+    Decorate a Utility method to time it as phase when the utility has stats
+    """
+
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.stats is None:
+                return method(self, *args, **kwargs)
+            with self.stats.phase(phase):
+                return method(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
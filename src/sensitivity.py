@@ -0,0 +1,108 @@
+import attr
+import numpy as np
+import pandas as pd
+
+from src.fitting import solve_master_equations
+
+
+@attr.s
+class Sensitivity(object):
+    """
+    Utilities and ranks of the alternatives under sampled scaling constants,
+    see sensitivity
+    """
+
+    # Labels of the alternatives
+    labels = attr.ib()
+    # Ranks with the elicited scaling constants, 1 being the best
+    base_ranks = attr.ib()
+    # samples x alternatives
+    utilities = attr.ib(repr=False)
+    ranks = attr.ib(repr=False)
+
+    def rank_distribution(self):
+        """
+        Return the frequency of every rank (columns) for every alternative
+        """
+        n = len(self.labels)
+        counts = np.zeros((n, n))
+        np.add.at(
+            counts, (np.tile(np.arange(n), len(self.ranks)), self.ranks.ravel() - 1), 1
+        )
+        return pd.DataFrame(
+            counts / len(self.ranks),
+            index=self.labels,
+            columns=pd.RangeIndex(1, n + 1, name="rank"),
+        )
+
+    def stability(self):
+        """
+        Return, for every alternative, its base rank, the mean, standard
+        deviation and 90% interval of its rank and how often it keeps its
+        base rank
+        """
+        return pd.DataFrame(
+            {
+                "base_rank": self.base_ranks,
+                "mean_rank": self.ranks.mean(axis=0),
+                "std_rank": self.ranks.std(axis=0),
+                "rank_5%": np.percentile(self.ranks, 5, axis=0),
+                "rank_95%": np.percentile(self.ranks, 95, axis=0),
+                "p_base_rank": (self.ranks == self.base_ranks).mean(axis=0),
+            },
+            index=self.labels,
+        ).sort_values("base_rank")
+
+    def spearman(self):
+        """
+        Return the Spearman correlation of every sampled ranking with the base
+        ranking
+        """
+        n = len(self.labels)
+        d = ((self.ranks - self.base_ranks) ** 2).sum(axis=1)
+        return 1 - 6 * d / (n * (n**2 - 1))
+
+
+def _ranks(utilities):
+    # 1 for the highest utility, along the last axis
+    return (-utilities).argsort(axis=-1).argsort(axis=-1) + 1
+
+
+def sensitivity(mauf, x, samples=1000, spread=0.2, seed=None):
+    """
+    Score the alternatives of x (a DataFrame or a dict of arrays keyed by
+    SAUF name) under samples draws of the scaling constants of every MAUF of
+    the tree, each drawn uniformly within +/- spread of its elicited value.
+
+    The k of all the draws are solved at once and every draw is scored with
+    array operations over samples x alternatives.
+
+    Return a Sensitivity
+    """
+    rng = np.random.default_rng(seed)
+    plan = mauf.compile()
+    leaves, _ = plan.leaves(x)
+    leaves = leaves[:, None, :]
+
+    values = list(np.broadcast_to(leaves, (len(plan.names), samples, leaves.shape[2])))
+    for children, weights, _ in plan.nodes:
+        drawn = weights * rng.uniform(1 - spread, 1 + spread, (samples, len(weights)))
+        drawn = np.clip(drawn, 1e-6, 1 - 1e-6)
+        k = solve_master_equations(drawn)[:, None]
+        utilities = np.array([values[child] for child in children])
+        additive = (
+            np.einsum("sc,csn->sn", drawn, utilities) / drawn.sum(axis=1)[:, None]
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scaled = k * drawn.T[:, :, None] * utilities + 1
+            multiplicative = (np.prod(scaled, axis=0) - 1) / k
+        values.append(np.where(k == 0, additive, multiplicative))
+
+    utilities = values[-1]
+    labels = list(x.index) if hasattr(x, "index") else list(range(utilities.shape[1]))
+    return Sensitivity(
+        labels=labels,
+        base_ranks=_ranks(plan.eval(x).ravel()),
+        utilities=utilities,
+        ranks=_ranks(utilities),
+    )
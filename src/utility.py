@@ -1,10 +1,26 @@
 import attr
+import json
 import numpy as np
-from lmfit import minimize, Parameters, Parameter
-import plotly.graph_objs as go
-import diofant
-from functools import reduce
-from operator import mul
+import time
+import zlib
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from src.families import FAMILIES, INTERPOLATIONS
+from src.fitting import solve_master_equation
+from src.instrumentation import Stats, timed
+
+# lmfit and plotly are imported by the methods using them, scoring an already
+# fitted function only needs numpy
+
+QUARTILES = [0.25, 0.5, 0.75]
+# Assessment points, from the worst to the best
+POINTS = ["worst", "lower_middle", "middle", "upper_middle", "best"]
+
+
+def _values(params):
+    # lmfit Parameters, or a plain dict for loaded functions
+    return params.valuesdict() if hasattr(params, "valuesdict") else dict(params)
 
 
 @attr.s
@@ -15,10 +31,17 @@ class Utility(object):
     data = attr.ib(default=None)
     is_cost = attr.ib(default=False)
     method = attr.ib(default="least_squares")
+    # Name of a family of src.families.FAMILIES, or a Family
+    family = attr.ib(default="exponential")
+    # "linear" or "pchip" to score by interpolating the points instead of
+    # fitting the family, see src.families.INTERPOLATIONS
+    interpolation = attr.ib(default=None)
     # Useful fo when adding an already calculated function
     params = attr.ib(default=None)
     # For MAUFs
     saufs = attr.ib(default={})
+    # Opt-in instrumentation, see src.instrumentation.Stats
+    stats = attr.ib(default=None, repr=False)
 
     @property
     def best(self):
@@ -36,7 +59,7 @@ class Utility(object):
             else:
                 self.__best = self.points.max()
                 if self.is_cost:
-                    self.__best = self.min.min()
+                    self.__best = self.points.min()
         return self.__best
 
     @property
@@ -55,64 +78,200 @@ class Utility(object):
             else:
                 self.__worst = self.points.min()
                 if self.is_cost:
-                    self.__worst = self.min.max()
+                    self.__worst = self.points.max()
         return self.__worst
 
-    def assess(self):
+    @timed("assess")
+    def assess(self, starts=1, tol=1e-10, workers=1, seed=None):
+        """
+        Return the assessment points minimizing the error of the fitted model
+
+        The middle points start from the previous assessment if any, else
+        from the quartiles of data. starts > 1 adds starts at quartiles
+        perturbed by Latin hypercube sampling, run over workers processes and
+        stopping as soon as one fits within tol, the best one being kept
+        """
         # TODO: mutually exclusive args
         # TODO: check for when best and worst are not extrema
 
         if self.optimal_fit:
-            points_params = Parameters()
-            worst = Parameter("worst", value=self.worst, vary=False)
-            lower_middle = Parameter("lower_middle")
-            middle = Parameter("middle")
-            upper_middle = Parameter("upper_middle")
-            best = Parameter("best", value=self.best, vary=False)
-            for param in [lower_middle, middle, upper_middle]:
-                param.set(min=self.data.min(), max=self.data.max())
-            points_params.add_many(worst, lower_middle, middle, upper_middle, best)
-
-            def objective(params):
-                v = params.valuesdict()
-                u = Utility(name="u", points=list(v.values()))
-                u.fit()
-                chisqr = u.result.chisqr
-                return chisqr
-
-            self.optimal_points = minimize(objective, points_params, method=self.method)
+            candidates = self._starts(starts, seed)
+            results = []
+            if workers == 1:
+                for start in candidates:
+                    results.append(self._minimize_points(start))
+                    if results[-1][1] <= tol:
+                        break
+            else:
+                # Without stats, which may not pickle, their counts are
+                # returned instead
+                copy = attr.evolve(self, stats=None)
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    futures = [
+                        executor.submit(_minimize_points, copy, start)
+                        for start in candidates
+                    ]
+                    for future in as_completed(futures):
+                        results.append(future.result())
+                        if results[-1][1] <= tol:
+                            for other in futures:
+                                other.cancel()
+                            break
+
+            self.optimal_points = min(results, key=lambda result: result[1])[0]
+            if self.stats is not None:
+                for _, _, calls, iterations in results:
+                    self.stats.objective_calls += calls
+                    self.stats.inner_iterations += iterations
+                self.stats.converged["assess"] = bool(self.optimal_points.success)
             v = self.optimal_points.params.valuesdict()
-            self.points = np.array(list(v.values()))
+            self.points = np.array([v[name] for name in POINTS])
         return self.points
 
-    def fit(self):
+    def _starts(self, starts, seed=None):
+        """
+        Return starting values of the middle points, one row per start
+        """
+        if self.points is not None and len(self.points) == 5:
+            first = np.sort(self.points[1:4])
+        else:
+            first = np.quantile(self.data, QUARTILES)
+        if starts == 1:
+            return first[None, :]
+        # Latin hypercube over the quartile levels, +/- half their spacing
+        rng = np.random.default_rng(seed)
+        n = starts - 1
+        strata = np.array([rng.permutation(n) for _ in QUARTILES]).T
+        hypercube = (strata + rng.uniform(size=strata.shape)) / n
+        levels = np.clip(np.array(QUARTILES) + (hypercube - 0.5) * 0.25, 0, 1)
+        others = np.quantile(self.data, np.sort(levels, axis=1))
+        return np.vstack([first, others])
+
+    def _minimize_points(self, start):
+        """
+        Run the outer minimization from the given middle points, which are
+        kept ordered between worst and best
+
+        Return the lmfit result, the error of the model fitted to its points,
+        the number of objective calls and of inner iterations
+        """
+        from lmfit import minimize, Parameters
+
+        # Each middle point lies a share (step) of the way from the previous
+        # point to best, which keeps the points ordered by construction
+        worst, best = self.worst, self.best
+        points_params = Parameters()
+        points_params.add("worst", value=worst, vary=False)
+        points_params.add("best", value=best, vary=False)
+        previous = worst
+        for i, value in enumerate(np.sort(start)[:: 1 if best >= worst else -1]):
+            share = (value - previous) / (best - previous) if best != previous else 0
+            points_params.add(
+                "step_{}".format(i), value=np.clip(share, 0, 1), min=0, max=1
+            )
+            previous = value
+        points_params.add("lower_middle", expr="worst + step_0 * (best - worst)")
+        points_params.add(
+            "middle", expr="lower_middle + step_1 * (best - lower_middle)"
+        )
+        points_params.add("upper_middle", expr="middle + step_2 * (best - middle)")
+
+        utilities = np.linspace(0, 1, 5)
+        family = self._family(interpolated=False)
+        counts = {"calls": 0, "iterations": 0}
+
+        def objective(params):
+            v = _values(params)
+            # Inner fit solved directly instead of a nested minimize
+            points = np.array([v[name] for name in POINTS])
+            fitted, _, iterations = family.solve(points, utilities)
+            counts["calls"] += 1
+            counts["iterations"] += iterations
+            # Residuals rather than their sum of squares, so that least
+            # squares methods see the structure of the problem
+            return family.evaluate(fitted, points) - utilities
+
+        result = minimize(objective, points_params, method=self.method)
+        sse = (objective(result.params) ** 2).sum()
+        return result, sse, counts["calls"], counts["iterations"]
+
+    def update(self, new_data):
+        """
+        Append new_data to data then assess and fit again, starting from the
+        previous points and parameters. Nothing is refitted when best, worst
+        and the quartiles of data are unchanged
+        """
+        previous = self._summary()
+        self.data = np.append(self.data, new_data)
+        if np.allclose(self._summary(), previous):
+            return self.points
+        if getattr(self, "result", None) is not None:
+            self.params = self.result.params
+        self.assess()
+        self.fit()
+        return self.points
+
+    def _summary(self):
+        return np.append([self.worst, self.best], np.quantile(self.data, QUARTILES))
+
+    @timed("fit")
+    def fit(self, jacobian=True):
+        """
+        Fit the model to the points with lmfit, using the analytic jacobian
+        unless jacobian is False (finite differences). Nothing is fitted when
+        the points are interpolated
+        """
+        if self.interpolation:
+            return None
+
+        from lmfit import minimize, Parameters
 
-        if not self.params:
+        family = self._family()
+        if not self.params or not hasattr(self.params, "valuesdict"):
+            if not self.params:
+                # Start from the family's own solution, minimize only
+                # polishes it
+                values, _, _ = family.solve(self.points, np.linspace(0, 1, 5))
+            else:
+                # Plain values of a loaded function
+                values = self.params
             self.params = Parameters()
-            a = Parameter(name="a", value=1)
-            b = Parameter(name="b", value=1)
-            c = Parameter(name="c", value=1)
-            self.params.add_many(a, b, c)
+            for name in family.params:
+                self.params.add(
+                    name, value=float(values[name]), vary=name not in family.fixed
+                )
 
         self.result = minimize(
             self.residuals,
             self.params,
             args=(self.points, np.linspace(0, 1, 5)),
             nan_policy="propagate",
+            Dfun=self.jacobian if jacobian else None,
         )
+        if self.stats is not None:
+            self.stats.fit_evaluations += self.result.nfev
+            self.stats.converged["fit"] = bool(self.result.success)
         return self.result
 
+    @property
+    def fitted_params(self):
+        """
+        Return the fitted parameters, or the provided ones when not fitted,
+        or the knots of the interpolation of the points
+        """
+        if self.interpolation:
+            return self._family().start(self.points, np.linspace(0, 1, 5))
+        result = getattr(self, "result", None)
+        return self.params if result is None else result.params
+
     def model(self, x, params=None):
         """
         Return an array of y values based on function calculated inside
         """
         if params is None:
-            params = self.result.params
-
-        v = params.valuesdict()
+            params = self.fitted_params
 
-        y = v["a"] + v["b"] ** (-v["c"] * np.array(x))
-        return y
+        return self._family().evaluate(_values(params), np.asarray(x, dtype=float))
 
     def normalized_model(self, x, params=None):
         """
@@ -120,57 +279,234 @@ class Utility(object):
         Used only after optimality
         """
         if params is None:
-            params = self.result.params
-        v = params.valuesdict()
-
-        lower = self.model(self.worst)
-        upper = self.model(self.best)
-        y = v["a"] + v["b"] ** (-v["c"] * np.array(x))
+            v, lower, upper = self._normalization()
+        else:
+            v = _values(params)
+            lower = self.model(self.worst)
+            upper = self.model(self.best)
+        y = self._family().evaluate(v, np.asarray(x, dtype=float))
+        if lower == 0 and upper == 1:
+            # Interpolated points spanning worst to best
+            return y
         return (y - lower) / (upper - lower)
 
+    def _normalization(self):
+        """
+        Return the fitted parameters as a dict and the lower and upper bounds
+        of the fitted function, cached until points, data, params, the fit or
+        the family or the interpolation change
+        """
+        if self._bounds is None:
+            self._bounds = (
+                _values(self.fitted_params),
+                self.model(self.worst),
+                self.model(self.best),
+            )
+        return self._bounds
+
+    def _family(self, interpolated=True):
+        """
+        Return the Family of the function, or the one interpolating its points
+        unless interpolated is False
+        """
+        if self.interpolation and interpolated:
+            return INTERPOLATIONS[self.interpolation]
+        return FAMILIES[self.family] if isinstance(self.family, str) else self.family
+
+    def __setattr__(self, name, value):
+        if name in (
+            "points",
+            "data",
+            "params",
+            "result",
+            "is_cost",
+            "family",
+            "interpolation",
+        ):
+            # Invalidate the cached normalization
+            object.__setattr__(self, "_bounds", None)
+        object.__setattr__(self, name, value)
+
     def residuals(self, params, x, data):
         """
         Return the gap
         """
         return self.model(x, params=params) - data
 
+    def jacobian(self, params, x, data):
+        """
+        Return the derivatives of the residuals with respect to the varying
+        parameters, one column per parameter
+        """
+        derivatives = self._family().jacobian(
+            _values(params), np.asarray(x, dtype=float)
+        )
+        return np.column_stack(
+            [derivatives[name] for name, param in params.items() if param.vary]
+        )
+
     def plot(self):
+        import plotly.graph_objs as go
+
         trace1 = go.Scatter(x=self.points, y=np.linspace(0, 1, 5))
         x = np.linspace(self.points.min(), self.points.max(), 50)
         y = self.normalized_model(x=x)
         trace2 = go.Scatter(x=x, y=y)
         return [trace1, trace2]
 
+    @timed("scale")
     def scale(self, **kwargs):
         # TODO: ensure provided kwargs are keys in saufs
         # pass the value of the scaling constant with key its name
         self.scaling_constants = kwargs
         ## TODO: Assuming order, should find a way to pair each ki to its value by name
         ## may not be necessary since we do not care about the value of each UF
-        scaling_constants = np.array(list(self.scaling_constants.values()))
-        if sum(scaling_constants) == 1:
-            self.k = 0
-        k = diofant.symbols("k")
-        rhs = reduce(mul, k * scaling_constants + 1, 1)
-        lhs = k + 1
-        sols = diofant.solve(lhs - rhs)
-        # as opposed to complex, filter real solutions
-        real_solutions = filter(
-            lambda sol: -1 <= sol.get(k) <= 1,
-            filter(lambda sol: sol.get(k).is_Float, sols),
-        )
-        not_null = [sol.get(k) for sol in real_solutions if sol.get(k) != 0]
-        if len(not_null) == 0:
-            self.k = 0
-        else:
-            self.k = not_null[0]
+        self.k = solve_master_equation(list(self.scaling_constants.values()))
+        if self.stats is not None:
+            self.stats.converged["scale"] = True
         return self.k
 
-    def eval(self, **kwargs):
-        if self.saufs:
-            lhs = 1 + self.k
+    @timed("eval")
+    def eval(self, x=None, **kwargs):
+        """
+        Return the utility of x, an array for a SAUF, a DataFrame or a dict of
+        arrays keyed by SAUF name for a MAUF (or for a SAUF), which may also
+        be passed as keyword arguments
+
+        The whole saufs tree is evaluated with array operations, one per node
+        """
+        if x is None:
+            x = kwargs
+        if not self.saufs:
+            # A dict or a DataFrame, not an array or a Series of values
+            if isinstance(x, Mapping) or hasattr(x, "columns"):
+                x = x[self.name]
+            return self.normalized_model(np.asarray(x, dtype=float))
+
+        weights = self._scaling_constants()
+        utilities = np.array([sauf.eval(x) for sauf in self.saufs.values()])
+        # One row per SAUF, whatever the shape of the alternatives
+        flat = utilities.reshape(len(weights), -1)
+        if self.k == 0:
+            u = weights @ flat / weights.sum()
         else:
-            return self.normalized_model(kwargs["x"])
+            # (prod(k * k_i * u_i + 1) - 1) / k is already normalized since k
+            # solves the master equation
+            scaled = self.k * weights[:, None] * flat
+            u = (np.prod(scaled + 1, axis=0) - 1) / self.k
+        return u.reshape(utilities.shape[1:])
+
+    def _scaling_constants(self):
+        """
+        Return the scaling constants as an array in the order of saufs
+        """
+        if set(self.scaling_constants) == set(self.saufs):
+            return np.array([self.scaling_constants[key] for key in self.saufs])
+        # Names do not match, assuming order
+        return np.array(list(self.scaling_constants.values()), dtype=float)
+
+    def compile(self):
+        """
+        Return a Plan evaluating the saufs tree without recursion
+        """
+        leaves, nodes = [], []
+
+        def flatten(utility):
+            # Index of the utility in the stack of values, children first
+            if not utility.saufs:
+                leaves.append(utility)
+                return ("leaf", len(leaves) - 1)
+            children = [flatten(sauf) for sauf in utility.saufs.values()]
+            nodes.append((children, utility._scaling_constants(), utility.k))
+            return ("node", len(nodes) - 1)
+
+        flatten(self)
+        # Values are stacked leaves first, then nodes in evaluation order
+        nodes = [
+            (
+                np.array(
+                    [i if kind == "leaf" else len(leaves) + i for kind, i in children]
+                ),
+                np.asarray(weights, dtype=float),
+                float(k),
+            )
+            for children, weights, k in nodes
+        ]
+        # Leaves grouped by family, with one row of parameters per leaf
+        families = {}
+        for i, leaf in enumerate(leaves):
+            family = leaf._family()
+            families.setdefault(family.name, (family, []))[1].append(i)
+        groups = []
+        for family, rows in families.values():
+            params = [_values(leaves[i].fitted_params) for i in rows]
+            values = {
+                name: np.array([v[name] for v in params], dtype=float)[:, None]
+                for name in family.params
+            }
+            groups.append((family, rows, values))
+        return Plan(
+            names=[leaf.name for leaf in leaves],
+            groups=groups,
+            lower=np.array([leaf.model(leaf.worst) for leaf in leaves]),
+            upper=np.array([leaf.model(leaf.best) for leaf in leaves]),
+            nodes=nodes,
+        )
+
+    def to_dict(self):
+        """
+        Return the fitted function as a dict of plain values: name, points,
+        params, is_cost, family and interpolation for a SAUF, its bounds
+        being the ends of the points, name, scaling constants, k and saufs
+        for a MAUF
+        """
+        if self.saufs:
+            return {
+                "name": self.name,
+                "scaling_constants": dict(getattr(self, "scaling_constants", {})),
+                "k": float(getattr(self, "k", 0)),
+                "saufs": {key: sauf.to_dict() for key, sauf in self.saufs.items()},
+            }
+        return {
+            "name": self.name,
+            "points": np.asarray(self.points, dtype=float).tolist(),
+            "params": {
+                key: float(value) for key, value in _values(self.fitted_params).items()
+            },
+            "is_cost": bool(self.is_cost),
+            "family": self._family(interpolated=False).name,
+            "interpolation": self.interpolation,
+        }
+
+    @classmethod
+    def from_dict(cls, d):
+        """
+        Return the Utility described by d, see to_dict
+        """
+        if "saufs" in d:
+            saufs = {key: cls.from_dict(sauf) for key, sauf in d["saufs"].items()}
+            utility = cls(name=d["name"], saufs=saufs)
+            utility.scaling_constants = d["scaling_constants"]
+            utility.k = d["k"]
+            return utility
+        return cls(
+            name=d["name"],
+            points=np.array(d["points"]),
+            is_cost=d["is_cost"],
+            params=d["params"],
+            family=d.get("family", "exponential"),
+            interpolation=d.get("interpolation"),
+        )
+
+    def to_bytes(self):
+        """
+        Return to_dict as compressed JSON
+        """
+        return zlib.compress(json.dumps(self.to_dict()).encode())
+
+    @classmethod
+    def from_bytes(cls, b):
+        return cls.from_dict(json.loads(zlib.decompress(b)))
 
     def expr(self):
         pass
@@ -182,3 +518,224 @@ class Utility(object):
 
     def __rmul__(self, other):
         return self.__mul__(other)
+
+
+@attr.s
+class Plan(object):
+    """
+    Flat, array based evaluation of a fitted SAUF or MAUF, see
+    Utility.compile
+    """
+
+    # One entry per SAUF
+    names = attr.ib()
+    # One (family, rows of its SAUFs, parameters with one row per SAUF) per
+    # family
+    groups = attr.ib()
+    lower = attr.ib()
+    upper = attr.ib()
+    # One (children, scaling constants, k) per MAUF, children before parents
+    nodes = attr.ib(default=[])
+
+    def leaves(self, x, out=None):
+        """
+        Return the utilities of the SAUFs for x, one row per SAUF, and the
+        shape of the arrays of x
+
+        Every row is evaluated straight from its array of x, without stacking
+        them, into out if given
+        """
+        shape = np.shape(x[self.names[0]])
+        if out is None:
+            out = np.empty((len(self.names), int(np.prod(shape))))
+        for family, rows, values in self.groups:
+            for j, i in enumerate(rows):
+                v = {name: value[j, 0] for name, value in values.items()}
+                column = np.asarray(x[self.names[i]], dtype=float).ravel()
+                out[i] = family.evaluate(v, column)
+                out[i] -= self.lower[i]
+                out[i] /= self.upper[i] - self.lower[i]
+        return out, shape
+
+    def eval(self, x=None, **kwargs):
+        """
+        Return the utility of x, a DataFrame or a dict of arrays keyed by SAUF
+        name, which may also be passed as keyword arguments
+        """
+        if x is None:
+            x = kwargs
+        shape = np.shape(x[self.names[0]])
+        values = np.empty((len(self.names) + len(self.nodes), int(np.prod(shape))))
+        self.leaves(x, out=values[: len(self.names)])
+        # Every node is accumulated in its row, one child at a time
+        scaled = np.empty(values.shape[1])
+        for i, (children, weights, k) in enumerate(self.nodes, len(self.names)):
+            node = values[i]
+            if k == 0:
+                node[:] = 0
+                for child, weight in zip(children, weights / weights.sum()):
+                    np.multiply(values[child], weight, out=scaled)
+                    node += scaled
+            else:
+                node[:] = 1
+                for child, weight in zip(children, weights):
+                    np.multiply(values[child], k * weight, out=scaled)
+                    scaled += 1
+                    node *= scaled
+                node -= 1
+                node /= k
+        return values[-1].reshape(shape)
+
+
+def fit_many(
+    frame,
+    is_cost=False,
+    method="least_squares",
+    family="exponential",
+    interpolation=None,
+):
+    """
+    Assess and fit a SAUF for every column of frame at once
+
+    is_cost is either a boolean for all the columns or the names of the cost
+    columns. For the families having an exact assessment, the points and
+    parameters are solved for all the columns as stacked arrays, only the
+    columns the model cannot interpolate exactly fall back on assess() and
+    fit(). interpolation is passed on to the SAUFs, which are then not
+    fitted. Missing values are left out of the data of their column.
+
+    Return a dict of fitted Utility keyed by column name
+    """
+    if isinstance(is_cost, bool):
+        is_cost = list(frame.columns) if is_cost else []
+    costs = np.array([column in is_cost for column in frame.columns])
+
+    values = frame.to_numpy(dtype=float)
+    present = ~np.isnan(values)
+    for column, any_present in zip(frame.columns, present.any(axis=0)):
+        if not any_present:
+            raise ValueError("Column {!r} has no values to fit".format(column))
+    lowest = np.nanmin(values, axis=0)
+    highest = np.nanmax(values, axis=0)
+    worst = np.where(costs, highest, lowest)
+    best = np.where(costs, lowest, highest)
+    family = FAMILIES[family] if isinstance(family, str) else family
+    points, params, solved = family.assess(worst, best, np.linspace(0, 1, 5))
+
+    utilities = {}
+    for i, column in enumerate(frame.columns):
+        u = Utility(
+            name=column,
+            optimal_fit=True,
+            data=values[present[:, i], i],
+            is_cost=bool(costs[i]),
+            method=method,
+            family=family,
+            interpolation=interpolation,
+        )
+        if solved[i]:
+            u.points = points[i]
+            u.params = {name: value[i] for name, value in params.items()}
+        else:
+            u.assess()
+            u.fit()
+        utilities[column] = u
+    return utilities
+
+
+def score_panel(
+    panel, build, reference=None, per_year=False, is_cost=False, family="exponential"
+):
+    """
+    Score every region of panel (see src.data.utils.Panel) for every year
+
+    The SAUFs of the panel indicators are fitted with fit_many, once on the
+    reference years (all the years by default) or for every year if per_year,
+    then build(saufs) must return the scaled MAUF to score. With a single
+    fit, all the years are scored in one evaluation of its compiled Plan.
+
+    Return a tidy frame of region, year and utility
+    """
+    import pandas as pd
+
+    def fit(years):
+        idx = [panel.years.index(year) for year in years]
+        # regions x years rows, one column per indicator
+        values = (
+            panel.values[:, :, idx]
+            .transpose(0, 2, 1)
+            .reshape(-1, len(panel.indicators))
+        )
+        frame = pd.DataFrame(values, columns=panel.indicators).dropna()
+        return build(fit_many(frame, is_cost=is_cost, family=family)).compile()
+
+    def x(idx):
+        return {
+            name: panel.values[:, i, idx] for i, name in enumerate(panel.indicators)
+        }
+
+    if per_year:
+        utility = np.stack(
+            [fit([year]).eval(x(i)) for i, year in enumerate(panel.years)], axis=1
+        )
+    else:
+        plan = fit(panel.years if reference is None else reference)
+        utility = plan.eval(x(slice(None)))
+    return pd.DataFrame(
+        {
+            "region": np.repeat(panel.regions, len(panel.years)),
+            "year": np.tile(panel.years, len(panel.regions)),
+            "utility": utility.ravel(),
+        }
+    )
+
+
+@attr.s
+class Assessment(object):
+    name = attr.ib()
+    utility = attr.ib()
+    # Wall time of assess and fit, in seconds
+    elapsed = attr.ib()
+
+
+def _minimize_points(utility, start):
+    return utility._minimize_points(start)
+
+
+def _assess_and_fit(utility):
+    start = time.perf_counter()
+    utility.assess()
+    utility.fit()
+    return Assessment(
+        name=utility.name, utility=utility, elapsed=time.perf_counter() - start
+    )
+
+
+def assess_all(utilities, workers=None):
+    """
+    Assess and fit independent SAUFs over a pool of worker processes
+
+    workers defaults to the number of processors, a single worker runs in
+    the current process. Either way utilities are assessed and fitted in
+    place.
+
+    Return a list of Assessment in the order of utilities
+    """
+    utilities = list(utilities)
+    if workers == 1:
+        return [_assess_and_fit(u) for u in utilities]
+    # Stats may not pickle, the workers count into fresh ones merged back
+    copies = [
+        attr.evolve(u, stats=None if u.stats is None else Stats()) for u in utilities
+    ]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        assessments = list(executor.map(_assess_and_fit, copies))
+    # The workers fitted copies, their fits are carried back to utilities
+    for assessment, u in zip(assessments, utilities):
+        for name in ("optimal_points", "points", "params", "result"):
+            if hasattr(assessment.utility, name):
+                setattr(u, name, getattr(assessment.utility, name))
+        if u.stats is not None:
+            u.stats.merge(assessment.utility.stats)
+        assessment.utility = u
+    return assessments